@@ -1,4 +1,79 @@
-import math, csv, re
+import math, csv, re, functools, bisect
+import numpy as np
+
+try:
+    from numba import njit, prange
+    _HAVE_NUMBA = True
+except ImportError:
+    _HAVE_NUMBA = False
+    # numba is an optional accelerator; without it the jitted helpers
+    # below simply run as plain Python
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        def wrap(func):
+            return func
+        return wrap
+    prange = range
+
+# cents per natural-log unit; lets hot paths use math.log directly
+# instead of going through the cent_diff call
+_CENTS_PER_LOG = 1200.0 / math.log(2.0)
+
+# note-name pattern, compiled once rather than per subscript
+_NOTE_RE = re.compile(r"[A-Z][b#]?|\d")
+
+@functools.lru_cache(maxsize=256)
+def _parse_name(name):
+    """Splits a note name like 'C#4' into its name and octave parts;
+    memoized since the same names recur constantly.
+    """
+    split = _NOTE_RE.findall(name)
+    return split[0], int(split[1])
+
+@njit(cache=True, fastmath=True)
+def _cent_diff(freq1, freq2):
+    """Jitted cent_diff for use inside compiled kernels, where
+    fastmath may reassociate it with surrounding exp2/log2 chains.
+    The plain cent_diff stays as-is for external callers that want
+    strict IEEE semantics.
+    """
+    return 1200.0*math.log2(freq2/freq1)
+
+@njit(cache=True, fastmath=True)
+def _note_freq(A4, i, j, steps, start, inv_steps, cents):
+    """Scalar core of Note.freq, kept free of attribute access so
+    numba can compile it (cached across imports). The octave part of
+    the exponent goes through ldexp (an exponent-field add) so only
+    the fractional step/cent part pays for a transcendental, and the
+    per-step division is a multiply by the EDO's cached reciprocal.
+    """
+    return A4 * math.ldexp(2.0**((i - steps - start)*inv_steps + cents/1200.0),
+                           j - 3)
+
+_LN2 = math.log(2.0)
+
+@njit(cache=True, fastmath=True)
+def _note_freq_ln(A4, i, j, steps, start, inv_steps, cents):
+    """Variant of _note_freq going through exp/log instead of 2**x;
+    LLVM lowers the two differently depending on platform, so the
+    faster one is picked at import when numba is available.
+    """
+    x = (i - steps - start)*inv_steps + cents/1200.0
+    return A4 * math.ldexp(math.exp(x*_LN2), j - 3)
+
+if _HAVE_NUMBA:
+    def _pick_note_freq():
+        import timeit
+        args = (440.0, 9, 4, 12, 9, 1.0/12.0, 0.0)
+        # first calls trigger (cached) compilation before timing
+        _note_freq(*args)
+        _note_freq_ln(*args)
+        t_pow = timeit.timeit(lambda: _note_freq(*args), number=10000)
+        t_ln = timeit.timeit(lambda: _note_freq_ln(*args), number=10000)
+        return _note_freq_ln if t_ln < t_pow else _note_freq
+
+    _note_freq = _pick_note_freq()
 
 def check_negative(freq):
     if freq < 0:
@@ -39,7 +114,7 @@ def detune(freq, cents=0):
     check_negative(freq)
     return freq*2**(cents/1200)
 	
-def overtones(freq, n=16):
+def overtones(freq, n=16, dtype=np.float64):
     """Returns the overtones of the desired frequency
 
     Parameters
@@ -48,15 +123,57 @@ def overtones(freq, n=16):
         The frequency
     n : int
         The number of overtones to generate
+    dtype : numpy dtype
+        The dtype of the returned array (default is float64)
 
     Returns
     -------
-    list
-        A list containing the frequency's overtones in ascending order 
+    numpy.ndarray
+        An array containing the frequency's overtones in ascending order
         (the base frequency is included as the first element)
     """
     check_negative(freq)
-    return [freq*i for i in range(1,n + 1)]
+    return freq*np.arange(1, n + 1, dtype=dtype)
+
+def overtone_cents(n=16):
+    """Returns the cent distances of the first n overtones from their
+    base frequency (independent of the frequency itself)
+
+    Parameters
+    ----------
+    n : int
+        The number of overtones to cover
+
+    Returns
+    -------
+    numpy.ndarray
+        An array containing the cent distance of each overtone from
+        the base frequency, in ascending order (the base frequency is
+        included as the first element, at 0 cents)
+    """
+    return 1200*np.log2(np.arange(1, n + 1, dtype=np.float64))
+
+def overtones_batch(freqs, n=16):
+    """Returns the overtones of several frequencies at once
+
+    Parameters
+    ----------
+    freqs : array_like
+        The frequencies
+    n : int
+        The number of overtones to generate per frequency
+
+    Returns
+    -------
+    numpy.ndarray
+        A (len(freqs), n) array where each row holds one frequency's
+        overtones in ascending order (the base frequency is included
+        as the first element)
+    """
+    freqs = np.asarray(freqs, dtype=np.float64)
+    if np.any(freqs < 0):
+        raise ValueError("negative frequency")
+    return np.outer(freqs, np.arange(1, n + 1, dtype=np.float64))
 
 def mirror(freq, freq_axis):
     """Returns the flipped frequency around the freq axis
@@ -96,11 +213,13 @@ def ifreq(freq_axis, index, steps=12):
         a frequency based on EDO distance from freq
     """
     check_negative(freq_axis)
-    return freq_axis*2**(index[0]/steps + index[1])
+    return freq_axis*math.ldexp(math.exp2(index[0]/steps), index[1])
 
 def get_closest_midi_note(freq, cent_thresh):
-    """Iterates the midi dict to find the item with smallest frequency difference,
-    determined by the cent threshold.
+    """Finds the MIDI note with the smallest frequency difference,
+    determined by the cent threshold. Since MIDI notes are exactly
+    100 cents apart, the nearest note index is computed directly
+    from the frequency instead of scanning all 128 notes.
 
     Parameters
     ----------
@@ -113,9 +232,40 @@ def get_closest_midi_note(freq, cent_thresh):
     -------
         The midi note nearest to the given frequency
     """
-    for item in midi_dict.items():
-        if abs(cent_diff(freq, item[1])) <= cent_thresh:
-            return item
+    n = round(69 + 12*math.log2(freq/440))
+    n = max(0, min(127, n))
+    midi_freq = _midi_freqs[n]
+    if abs(_CENTS_PER_LOG*math.log(freq/midi_freq)) <= cent_thresh:
+        return n, midi_freq
+
+def get_closest_note(freq, freqs, cent_thresh):
+    """Finds the entry of a sorted frequency table with the smallest
+    frequency difference, determined by the cent threshold. Generic
+    counterpart of get_closest_midi_note for tables without the
+    100-cent spacing that makes the log2 shortcut possible (e.g.
+    custom microtonal MIDI banks): a bisect plus one neighbor check
+    instead of a scan.
+
+    Parameters
+    ----------
+    freq : float
+        The given frequency
+    freqs : sequence
+        The frequency table, sorted in ascending order
+    cent_thresh : float
+        The cent threshold
+
+    Returns
+    -------
+        The index and frequency of the table entry nearest to the
+        given frequency
+    """
+    idx = bisect.bisect_left(freqs, freq)
+    lo = max(idx - 1, 0)
+    hi = min(idx, len(freqs) - 1)
+    n = lo if abs(freqs[lo] - freq) <= abs(freqs[hi] - freq) else hi
+    if abs(cent_diff(freq, freqs[n])) <= cent_thresh:
+        return n, freqs[n]
 
 def get_midi(freq):
     """Returns a MIDI event representing the given frequency.
@@ -136,14 +286,132 @@ def get_midi(freq):
     max_cents = 200
     ratio = max_wheel/max_cents
     midi_num, midi_freq = get_closest_midi_note(freq, 50.1)
-    wheel = int(cent_diff(midi_freq, freq)*ratio)
+    wheel = int(_CENTS_PER_LOG*math.log(freq/midi_freq)*ratio)
     return midi_num, wheel
 
+def get_midi_batch(freqs):
+    """Returns MIDI events for a whole batch of frequencies at once.
+    Vectorized counterpart of get_midi: the nearest notes come from
+    one log2-indexing pass and the pitch wheel values from a second,
+    instead of a scan per frequency.
+
+    Parameters
+    ----------
+    freqs : array_like
+        The desired frequencies
+
+    Returns
+    -------
+        A tuple of two arrays holding the nearest MIDI notes and the
+        pitch wheel values respectively
+    """
+    max_wheel = 8191
+    max_cents = 200
+    ratio = max_wheel/max_cents
+    freqs = np.asarray(freqs, dtype=np.float64)
+    n = np.clip(np.rint(69 + 12*np.log2(freqs/440)).astype(np.int32), 0, 127)
+    wheel = (1200*np.log2(freqs/_midi_freqs[n])*ratio).astype(np.int32)
+    return n, wheel
+
+def freqs_from_indices(edo, i, j, cents=None):
+    """Returns the frequencies of a whole batch of notes at once.
+    Equivalent to building a Note per index pair and calling freq(),
+    but computed as a single vectorized exp2 with no intermediate
+    Note objects.
+
+    Parameters
+    ----------
+    edo : EDO
+        The EDO the indices refer to
+    i : array_like
+        The step indices
+    j : array_like
+        The octave indices
+    cents : array_like, optional
+        Per-note detune amounts in cents
+
+    Returns
+    -------
+    numpy.ndarray
+        The frequencies of the indexed notes
+    """
+    i = np.asarray(i, dtype=np.float64)
+    j = np.asarray(j, dtype=np.float64)
+    exponent = (i - edo.steps - edo.start)*edo._inv_steps + (j - 3)
+    if cents is not None:
+        exponent = exponent + np.asarray(cents, dtype=np.float64)/1200.0
+    return edo.A4 * np.exp2(exponent)
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _render(A4, i_arr, j_arr, cents_arr, steps, start, inv_steps, out):
+    for k in prange(i_arr.size):
+        out[k] = A4 * 2.0**((i_arr[k] - steps - start)*inv_steps
+                            + (j_arr[k] - 3) + cents_arr[k]/1200.0)
+
+def render_freqs(edo, i, j, cents=None, out=None):
+    """Renders the frequencies of a batch of notes, splitting the
+    work across cores when numba is installed (falls back to the
+    single-threaded freqs_from_indices otherwise).
+
+    Parameters
+    ----------
+    edo : EDO
+        The EDO the indices refer to
+    i : array_like
+        The step indices
+    j : array_like
+        The octave indices
+    cents : array_like, optional
+        Per-note detune amounts in cents
+    out : numpy.ndarray, optional
+        A preallocated output array, to avoid a fresh allocation per
+        render call
+
+    Returns
+    -------
+    numpy.ndarray
+        The frequencies of the indexed notes
+    """
+    i = np.ascontiguousarray(i, dtype=np.float64)
+    j = np.ascontiguousarray(j, dtype=np.float64)
+    if cents is None:
+        cents = np.zeros_like(i)
+    else:
+        cents = np.ascontiguousarray(cents, dtype=np.float64)
+    if out is None:
+        out = np.empty_like(i)
+    if _HAVE_NUMBA:
+        _render(edo.A4, i, j, cents, edo.steps, edo.start,
+                edo._inv_steps, out)
+    else:
+        out[:] = freqs_from_indices(edo, i, j, cents)
+    return out
+
+def load_table(path):
+    """Reads a note-name table for the EDO constructor from a csv
+    file, one row of alternative names per step (see 12edo.csv)
+
+    Parameters
+    ----------
+    path : str or path-like
+        The path of the csv file
+
+    Returns
+    -------
+    list
+        A list of lists containing the different names for each note
+    """
+    with open(path, newline='') as f:
+        return list(csv.reader(f))
+
 
 class EDO:
     """Equal Divisions of Octave; produces 'Notes' using step/octave indexing.
     """
 
+    __slots__ = ('A4', 'start', 'table', 'dict', 'steps',
+                 '_inv_steps', '_step_cents', '_freq_table')
+
     def __init__(self, A4, steps=0, table=None, start=0):
         """Constructs an EDO either using steps or a table 
         (size of table determines total steps)
@@ -162,38 +430,44 @@ class EDO:
         self.A4 = A4
         self.start = start
         if table is not None:
-            size = len(table)
-            # move elements according to where the start is
-            if start != 0:
-                self.table = table[:start] + table[start:]
-            else:
-                self.table = table
-            self.dict = {n:i for i in range(size) for n in self.table[i]}
-            self.steps = size
+            # start is accounted for in Note.freq, so the table is
+            # stored as-is (immutable rows, no copy)
+            self.table = tuple(tuple(row) for row in table)
+            self.dict = {n:i for i, row in enumerate(self.table) for n in row}
+            self.steps = len(self.table)
         elif steps != 0:
             self.table = None
+            self.dict = None
             self.steps = steps
         else:
             raise ValueError('either table or steps must be specified')
+        self._inv_steps = 1.0/self.steps
+        self._step_cents = 1200.0/self.steps
+        # frequency LUT for normalized indices over octaves -1..9;
+        # Note.freq reads it instead of recomputing an exp2 per call
+        i_range = np.arange(self.steps)
+        oct_range = np.arange(-1, 10)
+        self._freq_table = A4 * np.exp2(
+            (i_range[:, None] - self.steps - start)*self._inv_steps
+            + (oct_range[None, :] - 3))
 
     def __getitem__(self, index):
         # extract note name and octave if string
         if isinstance(index, str):
             if self.dict is None:
                 raise Exception('no dictionary defined in EDO')
-            split = re.findall(r"[A-Z][b#]?|\d", index)
-            # i : step index
-            i = self.dict[split[0]]
-            # j : octave index
-            j = int(split[1])
-            index = i, j
+            name, j = _parse_name(index)
+            index = self.dict[name], j
         # nothing to do when tuple, just check if it isn't
         elif not isinstance(index, tuple):
             raise ValueError('invalid index type')
         return Note(self, index)
             
     def step_in_cents(self):
-        return cent_diff(self[0,4].freq(), self[1,4].freq())
+        """Returns the size of one step in cents; exactly 1200/steps
+        by the definition of an EDO, so no notes are ever built here.
+        """
+        return self._step_cents
 
     def __str__(self):
         return '<{}.{} steps={} A4={} at {}>'.format(
@@ -217,6 +491,9 @@ class Note:
      the EDO used or using intervals.
     """
 
+    __slots__ = ('edo', 'index', 'start', 'end', 'velocity', 'cents',
+                 '_freq')
+
     def __init__(self, edo, index):
         self.edo = edo
         self.index = index
@@ -224,6 +501,7 @@ class Note:
         self.end = 0
         self.velocity = 96
         self.cents = 0
+        self._freq = None
 
     def names(self):
         if self.edo is None or self.edo.table is None:
@@ -240,14 +518,24 @@ class Note:
 
     def detune(self, cents):
         self.cents = cents
+        self._freq = None
         return self
 
     def freq(self):
-        A4 = self.edo.A4
-        i = self.index[0] - self.edo.steps - self.edo.start
-        j = self.index[1] - 3
-
-        return detune(ifreq(A4, (i, j), self.edo.steps), self.cents)
+        # notes only change through detune, which drops the cache
+        if self._freq is None:
+            edo = self.edo
+            i, j = self.index
+            if type(i) is int and type(j) is int \
+                    and 0 <= i < edo.steps and -1 <= j <= 9:
+                f = edo._freq_table[i, j + 1]
+                if self.cents:
+                    f *= 2.0**(self.cents/1200.0)
+                self._freq = float(f)
+            else:
+                self._freq = _note_freq(edo.A4, i, j, edo.steps, edo.start,
+                                        edo._inv_steps, self.cents)
+        return self._freq
 
     def __getitem__(self, index):
         """Creates a new note based on index. The EDO and detuned cents are also passed.
@@ -256,31 +544,48 @@ class Note:
         also provides the octave.
         Interval: by using float. Sets this note as the axis for the new note.
         """
-        if isinstance(index, (int, tuple)):
-            if isinstance(index, tuple):
-                i = self.index[0] + index[0]
-                j = self.index[1] + index[1]
-            else:
-                i = self.index[0] + index
-                j = self.index[1]
-            n_index = i%self.edo.steps, i//self.edo.steps + j
-            cents = 0
-        elif isinstance(index, float):
-            freq = self.freq()
-            cent_dist = cent_diff(freq, freq * index)
-            step_in_cents = self.edo.step_in_cents()
-            closest_i = round(round(cent_dist/step_in_cents))
+        edo = self.edo
+        cents = 0
+        # exact type checks keep the common paths cheap; subclasses
+        # are normalized below and re-dispatched
+        if type(index) is int:
+            i = self.index[0] + index
+            j = self.index[1]
+        elif type(index) is tuple:
+            i = self.index[0] + index[0]
+            j = self.index[1] + index[1]
+        elif type(index) is float:
+            cent_dist = _CENTS_PER_LOG*math.log(index)
+            step_in_cents = edo._step_cents
+            closest_i = round(cent_dist/step_in_cents)
             i = self.index[0] + closest_i
             j = self.index[1]
-            n_index = i%self.edo.steps, i//self.edo.steps + j
             cents = cent_dist - closest_i*step_in_cents
+        elif isinstance(index, int):
+            return self[int(index)]
+        elif isinstance(index, tuple):
+            return self[tuple(index)]
+        elif isinstance(index, float):
+            return self[float(index)]
         else:
             raise ValueError('invalid value for index/interval')
-        return Note(self.edo, n_index).detune(self.cents + cents)
+        q, r = divmod(i, edo.steps)
+        return Note(edo, (r, q + j)).detune(self.cents + cents)
 
     def get_midi(self):
         return get_midi(self.freq())
 
+    def get_midi_fast(self):
+        """Like get_midi but goes straight through the log2-indexed
+        lookup, skipping the threshold check and the intermediate
+        (note, frequency) tuple. Same result for any audible
+        frequency; kept separate so get_midi's behaviour on
+        out-of-range input is unchanged.
+        """
+        f = self.freq()
+        n = max(0, min(127, round(69 + 12*math.log2(f/440))))
+        return n, int(_CENTS_PER_LOG*math.log(f/_midi_freqs[n])*(8191/200))
+
     def __str__(self):
         return '<{}.{} name(s)={}, index={}, ({}c) at {}>'.format(
         self.__class__.__module__,
@@ -293,8 +598,22 @@ class Note:
     def __repr__(self):
         return str(self)
 
-import pathlib
-
-filename = pathlib.Path(__file__).parent / '12edo.csv'
-table = list(csv.reader(open(filename)))
-midi_dict =  {i : ifreq(440, (i -69, 0)) for i in range(128)}
+# note names of the standard 12-tone system (formerly parsed from
+# 12edo.csv, which is kept as a format example for custom tables)
+table = (
+    ('C', 'B#', 'Dbb'),
+    ('Db', 'C#', 'Bx'),
+    ('D', 'Ebb', 'Cx'),
+    ('Eb', 'D#', 'Fbb'),
+    ('E', 'Fb', 'Dx'),
+    ('F', 'E#', 'Gbb'),
+    ('Gb', 'F#', 'Ex'),
+    ('G', 'Abb', 'Fx'),
+    ('Ab', 'G#'),
+    ('A', 'Bbb', 'Gx'),
+    ('Bb', 'A#', 'Cbb'),
+    ('B', 'Cb', 'Ax'),
+)
+# frequencies of the 128 MIDI notes, computed in one vectorized exp2
+_midi_freqs = 440.0 * np.exp2((np.arange(128, dtype=np.float64) - 69) / 12.0)
+midi_dict = dict(enumerate(_midi_freqs.tolist()))